@@ -1,6 +1,7 @@
 """Main process with queue management and remote LRS communication."""
 
 
+import collections
 from datetime import datetime
 import json
 import logging
@@ -10,100 +11,207 @@ import sys
 import threading
 import time
 
-from pyinotify import WatchManager, Notifier, NotifierError, EventsCodes, ProcessEvent
-from tincan import statement_list
-
 from xapi_bridge import client
 from xapi_bridge import converter
 from xapi_bridge import exceptions
 from xapi_bridge import settings
-
-if settings.HTTP_PUBLISH_STATUS is True:
-    from xapi_bridge import server
+from xapi_bridge import watcher
 
 
 logger = logging.getLogger('edX-xapi-bridge main')
 
+# optional HTTP status server and its thread, started in __main__
+http_server = None
+thread = None
+
 
 class QueueManager:
     """Manages the batching and publishing of statements in a thread-safe way."""
 
+    # seconds to wait on shutdown for the publisher thread to send what is queued
+    STOP_TIMEOUT = 30
+
+    # seconds to wait before publishing again after an unexpected error
+    ERROR_RETRY_DELAY = 10
+
     def __init__(self):
-        self.cache = []
-        self.cache_lock = threading.Lock()
-        self.publish_timer = None
+        # deque append and popleft are atomic, so the log reader never waits
+        # on a publish in progress
+        self.cache = collections.deque()
         self.publish_retries = 0
         self.total_published_successfully = 0
 
+        # statements are published from a dedicated thread so the log reader
+        # is never blocked on a request to the LRS
+        self.publish_cv = threading.Condition()
+        self.stopped = False
+        self.publisher_thread = threading.Thread(target=self._publisher_loop)
+        self.publisher_thread.daemon = True
+        self.publisher_thread.start()
+
     def __del__(self):
         self.destroy()
 
     def destroy(self):
-        if self.publish_timer is not None:
-            self.publish_timer.cancel()
+        """Stop the publisher thread, waiting for it to publish the statements still queued or in flight."""
+        with self.publish_cv:
+            self.stopped = True
+            self.publish_cv.notify()
+        if self.publisher_thread.is_alive() and threading.current_thread() is not self.publisher_thread:
+            self.publisher_thread.join(self.STOP_TIMEOUT)
 
     def push(self, stmt):
         """Add a statement to the outgoing queue."""
-        # push statement to queue
-        with self.cache_lock:
-            self.cache.append(stmt)
-
-        # set timeout to publish statements
-        if len(self.cache) == 1 and settings.PUBLISH_MAX_WAIT_TIME > 0:
-            self.publish_timer = threading.Timer(settings.PUBLISH_MAX_WAIT_TIME, self.publish)
-            self.publish_timer.start()
-
-        # publish immediately if statement threshold is reached
-        if settings.PUBLISH_MAX_PAYLOAD <= len(self.cache):
-            self.publish()
+        self.push_many((stmt, ))
+
+    def push_many(self, stmts):
+        """Add a sequence of statements to the outgoing queue."""
+        if not stmts:
+            return
+
+        # serialize statements here on the log reader's thread, once,
+        # so the publisher only joins them into a request body, retries included
+        self.cache.extend([stmt.to_json() for stmt in stmts])
+        queued = len(self.cache)
+
+        # only wake the publisher when a batch opens or the statement threshold is reached
+        if queued == len(stmts) or settings.PUBLISH_MAX_PAYLOAD <= queued:
+            with self.publish_cv:
+                self.publish_cv.notify()
+
+    def _publisher_loop(self):
+        """Publish queued statements when the payload threshold or the maximum wait time is reached."""
+        max_wait = settings.PUBLISH_MAX_WAIT_TIME if settings.PUBLISH_MAX_WAIT_TIME > 0 else None
+        while True:
+            with self.publish_cv:
+                # sleep without a timeout while there is nothing to publish
+                while not self.stopped and len(self.cache) == 0:
+                    self.publish_cv.wait()
+
+                # then until the statement threshold or the maximum wait time is reached
+                if max_wait is not None:
+                    deadline = time.time() + max_wait
+                while not self.stopped and len(self.cache) < settings.PUBLISH_MAX_PAYLOAD:
+                    if max_wait is None:
+                        self.publish_cv.wait()
+                        continue
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.publish_cv.wait(remaining)
+
+                stopped = self.stopped
+
+            # on stop, flush what is left before exiting
+            try:
+                self.publish()
+            except Exception:
+                # keep the publisher alive; an unexpected error must not stop publishing for good
+                logger.exception("Unexpected error publishing statements to the LRS, %d statements queued", len(self.cache))
+                if not stopped:
+                    # don't send the statements put back again right away
+                    with self.publish_cv:
+                        if not self.stopped:
+                            self.publish_cv.wait(self.ERROR_RETRY_DELAY)
+                    continue
+            if stopped:
+                return
 
     def publish(self):
         """Publish the queued statements to the LRS and clear the queue."""
-        # make sure no new statements are added while publishing
-        with self.cache_lock:
-
-            # build StatementList
-
-            lrs_success = False
-            statements = statement_list.StatementList(self.cache)
-
-            while lrs_success is False and len(statements) > 0:
-                try:
-                    lrs_resp = client.lrs_publisher.publish_statements(statements)
-                    lrs_success = True
-                    self.publish_retries = 0  # reset retries
-                    self.total_published_successfully += len(statements)
-                    logger.error("{} statements published successfully".format(self.total_published_successfully))
-                    if getattr(settings, 'TEST_LOAD_SUCCESSFUL_STATEMENTS_BENCHMARK', 0) > 0:
-                        benchmark = settings.TEST_LOAD_SUCCESSFUL_STATEMENTS_BENCHMARK
-                        if self.total_published_successfully >= benchmark:
-                            logger.error("published {} or more statements at {}".format(benchmark, datetime.now()))
-                except exceptions.XAPIBridgeLRSConnectionError as e:
-                    # if it was an auth problem, fail
-                    # if it was a connection problem, retry
-                    if self.publish_retries <= settings.PUBLISH_MAX_RETRIES:
-                        self.publish_retries += 1
-                    else:
-                        e.err_fail()
-                        break
-                except exceptions.XAPIBridgeStatementStorageError as e:
-                    # remove the failed Statement from StatementList
-                    # and retry, logging non-failing exception
-                    e.message = "Removing rejected Statement and retrying publishing StatementList. Rejected Statement was {}. LRS message was {}".format(e.statement.to_json(), e.message)
-                    e.err_continue_msg()
-                    statements.remove(e.statement)
-
-            # clear the cache and cancel publish timer whether successful or not
-            self.cache = []
-            if self.publish_timer is not None:
-                self.publish_timer.cancel()
-
-
-class NotifierLostINodeException(NotifierError):
+        # take the queued statements; new statements keep being queued
+        # while this batch is sent to the LRS
+        queued = self._drain()
+
+        # send the queue in batches of at most PUBLISH_BATCH_SIZE statements
+        batch_size = getattr(settings, 'PUBLISH_BATCH_SIZE', settings.PUBLISH_MAX_PAYLOAD)
+        for i in range(0, len(queued), batch_size):
+            try:
+                published = self._publish_batch(queued[i:i + batch_size])
+            except Exception:
+                # put the statements not sent back at the front of the queue to publish them later
+                self.cache.extendleft(reversed(queued[i:]))
+                raise
+            if not published:
+                break
+
+    def _drain(self):
+        """Remove and return the currently queued statements as a list."""
+        queued = []
+        try:
+            for _ in range(len(self.cache)):
+                queued.append(self.cache.popleft())
+        except IndexError:  # emptied by a concurrent publish
+            pass
+        return queued
+
+    def _publish_batch(self, batch):
+        """Publish a list of statements serialized to JSON to the LRS in a single request.
+
+        A statement the LRS reports as rejected is dropped and the rest of the batch sent again.
+        If the LRS rejects the batch without identifying the statement, split it in halves
+        and publish each half, so a single bad statement costs O(log n) requests.
+        Return False if the LRS could not be reached.
+        """
+        # flags for the statements of batch still to be sent
+        valid = bytearray(b'\x01' * len(batch))
+        statements = batch
+
+        while True:
+            try:
+                client.lrs_publisher.publish_statements(statements)
+            except exceptions.XAPIBridgeLRSConnectionError as e:
+                # if it was an auth problem, fail
+                # if it was a connection problem, retry
+                if self.publish_retries <= settings.PUBLISH_MAX_RETRIES:
+                    self.publish_retries += 1
+                    continue
+                e.err_fail()
+                return False
+            except exceptions.XAPIBridgeLRSResponseError as e:
+                # the LRS may have stored the batch already; sending it again could store it twice
+                e.err_continue_msg()
+                return True
+            except exceptions.XAPIBridgeStatementStorageError as e:
+                # the rejected statement is an element of the batch sent, found by identity
+                rejected = next(i for i, st in enumerate(batch) if st is e.statement)
+                # remove the failed Statement from the batch
+                # and retry, logging non-failing exception
+                e.message = "Removing rejected Statement and retrying publishing batch. Rejected Statement was {}. LRS message was {}".format(e.statement, e.message)
+                e.err_continue_msg()
+                valid[rejected] = 0
+                statements = [st for st, ok in zip(batch, valid) if ok]
+                if len(statements) == 0:
+                    return True
+                continue
+            except exceptions.XAPIBridgeLRSBackendResponseParseError as e:
+                return self._publish_halves(statements, e)
+
+            self.publish_retries = 0  # reset retries
+            self.total_published_successfully += len(statements)
+            logger.info("%d statements published successfully", self.total_published_successfully)
+            if getattr(settings, 'TEST_LOAD_SUCCESSFUL_STATEMENTS_BENCHMARK', 0) > 0:
+                benchmark = settings.TEST_LOAD_SUCCESSFUL_STATEMENTS_BENCHMARK
+                if self.total_published_successfully >= benchmark:
+                    logger.error("published %d or more statements at %s", benchmark, datetime.now())
+            return True
+
+    def _publish_halves(self, statements, e):
+        """Publish each half of a rejected list of statements, dropping it if it is a single statement."""
+        if len(statements) == 1:
+            # drop the rejected Statement, logging non-failing exception
+            e.message = "Dropping rejected Statement. Rejected Statement was {}. LRS message was {}".format(statements[0], e.message)
+            e.err_continue_msg()
+            return True
+        half = len(statements) // 2
+        return self._publish_batch(statements[:half]) and self._publish_batch(statements[half:])
+
+
+class NotifierLostINodeException(Exception):
     """Exception to handle inotify loss of current watched inode."""
 
 
-class TailHandler(ProcessEvent):
+class TailHandler(object):
     """Parse incoming log events, convert to xapi, and add to publish queue."""
 
     # watch create and moved to events since tracking log may be re-created during log rotation
@@ -113,55 +221,56 @@ class TailHandler(ProcessEvent):
     # 30     16      7       1       2            1     1          1            /edx/var/log/tracking/tracking.log
     # depending on the kernel and underlying inotify, either or both of IN_MOVE_SELF or IN_DELETE_SELF will fire
     # exit the handler on whichever fires first
-    MASK = EventsCodes.OP_FLAGS['IN_MODIFY'] | EventsCodes.OP_FLAGS['IN_MOVE_SELF'] | EventsCodes.OP_FLAGS['IN_DELETE_SELF']
+    MASK = watcher.IN_MODIFY | watcher.IN_MOVE_SELF | watcher.IN_DELETE_SELF
 
-    def my_init(self, **kw):
-        # called via __init__ on superclass
-        # prepare file input stream
-        self.ifp = open(kw['filename'], 'r', 1)
-        self.ifp.seek(0, 2)
+    # bytes read from the tracking log per read() call
+    READ_SIZE = 1 << 20
+
+    def __init__(self, filename):
+        # prepare raw file descriptor positioned at the end of the log;
+        # lines are handed to the JSON decoder as bytes
+        self.fd = os.open(filename, os.O_RDONLY | os.O_NONBLOCK)
+        os.lseek(self.fd, 0, os.SEEK_END)
         self.publish_queue = QueueManager()
-        self.raceBuffer = ''
+        self.raceBuffer = bytearray()
 
     def __enter__(self):
         return self
 
     def __exit__(self, etype, value, traceback):
-        # flush queue before exiting
-        self.publish_queue.publish()
+        # the publisher thread flushes the queue before exiting
         self.publish_queue.destroy()
-        self.ifp.close()
+        os.close(self.fd)
 
     def process_IN_MODIFY(self, event):
         """Handle any changes to the log file."""
         # read all new contents from the end of the file
-        buff = self.raceBuffer + self.ifp.read()
-
-        # if there's no newline at end of file, we probably read it before edx finished writing
-        # add read contents to a buffer and return
-        if len(buff) != 0 and buff[-1] != '\n':
-            self.raceBuffer = buff
-
-        else:
-            self.raceBuffer = ''
-            evts = [i for i in buff.split('\n') if len(i) != 0]
-            for e in evts:
-                try:
-                    evt_obj = json.loads(e)
-                except ValueError:
-                    logger.warn('Could not parse JSON for', e)
-                    continue
-
-                xapi = None
-                try:
-                    xapi = converter.to_xapi(evt_obj)
-                except (exceptions.XAPIBridgeStatementConversionError, ) as e:
-                    e.err_continue_msg()
-
-                if xapi is not None:
-                    for i in xapi:
-                        self.publish_queue.push(i)
-                        # print u'{} - {} {} {}'.format(i['timestamp'], i['actor']['name'], i['verb']['display']['en-US'], i['object']['definition']['name']['en-US'])
+        while True:
+            chunk = os.read(self.fd, self.READ_SIZE)
+            if not chunk:
+                break
+            self.raceBuffer.extend(chunk)
+
+        # anything after the last newline was probably read before edx finished writing it
+        # keep it in the buffer until the next change
+        last_newline = self.raceBuffer.rfind(b'\n')
+        if last_newline == -1:
+            return
+        lines = memoryview(self.raceBuffer)[:last_newline].tobytes().split(b'\n')
+        del self.raceBuffer[:last_newline + 1]
+
+        evts = []
+        for e in lines:
+            # skip decoding lines whose events would not be converted anyway
+            if not e or not converter.is_convertible_line(e):
+                continue
+            try:
+                evts.append(json.loads(e))
+            except ValueError:
+                logger.warning("Could not parse JSON: %s", e)
+
+        # convert the whole read at once and queue the statements together
+        self.publish_queue.push_many(converter.to_xapi_batch(evts))
 
     def process_IN_MOVE_SELF(self, event):
         """Handle moved tracking log file; e.g., during log rotation."""
@@ -177,28 +286,27 @@ class TailHandler(ProcessEvent):
 
 
 def watch(watch_file):
-    """Watch the given file for changes."""
-    logger.error('Starting watch')
-    wm = WatchManager()
-
-    try:
-        with TailHandler(filename=watch_file) as th:
-            logger.error('adding pyinotify watcher/notifier')
-            notifier = Notifier(wm, th, read_freq=settings.NOTIFIER_READ_FREQ, timeout=settings.NOTIFIER_POLL_TIMEOUT)
-            wm.add_watch(watch_file, TailHandler.MASK)
-            notifier.loop()
-    except NotifierLostINodeException:
-        # end and restart watch
-        logger.error("stopping notifier and restarting watch")
-        notifier.stop()  # close inotify instance
-        watch(watch_file)
-    finally:
-        logger.error('Exiting watch')
+    """Watch the given file for changes, restarting the watch when the file is replaced."""
+    while True:
+        logger.error('Starting watch')
+
+        try:
+            with TailHandler(filename=watch_file) as th:
+                logger.error('adding inotify watcher')
+                # a new inotify instance for each watch of the file, closed when the watch ends
+                with watcher.Watcher(watch_file, TailHandler.MASK, th) as notifier:
+                    notifier.loop()
+            break
+        except NotifierLostINodeException:
+            # end and restart watch
+            logger.error("stopping notifier and restarting watch")
+        finally:
+            logger.error('Exiting watch')
 
 
 def signal_terminate_handler(signum, frame):
     """Handle terminating signals from terminal or sysctl to properly shut down."""
-    if settings.HTTP_PUBLISH_STATUS is True:
+    if http_server is not None:
         logger.info("Shutting down http server")
         http_server.shutdown()
         http_server.socket.close()
@@ -229,6 +337,7 @@ if __name__ == '__main__':
     if settings.HTTP_PUBLISH_STATUS is True:
         # open a TCP socket and HTTP server for simple OK status response
         # for service uptime monitoring
+        from xapi_bridge import server
         http_server = server.httpd
         thread = threading.Thread(target=http_server.serve_forever)
         thread.daemon = True
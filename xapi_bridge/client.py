@@ -1,10 +1,16 @@
 """xAPI Client to send payload data."""
 
+import httplib
 import importlib
 import json
 import logging
 import socket
+import threading
+import urllib
+from urlparse import urlparse
 
+from tincan.http_request import HTTPRequest
+from tincan.lrs_response import LRSResponse
 from tincan.remote_lrs import RemoteLRS
 
 from xapi_bridge import exceptions
@@ -23,7 +29,158 @@ else:
 
 logger = logging.getLogger(__name__)
 
-lrs = RemoteLRS(**kw)
+
+def _closed_without_response(error):
+    """Return True if a BadStatusLine means the server closed the connection before sending anything."""
+    # depending on the Python 2.7 release, httplib reports an empty status line as '', "''" or a message
+    line = error.line.strip("'")
+    return not line or line.startswith('No status line received')
+
+
+class KeepAliveRemoteLRS(RemoteLRS):
+    """RemoteLRS which reuses one persistent HTTP connection to the LRS.
+
+    tincan's RemoteLRS opens a new connection, with a new TLS handshake for HTTPS, for every request.
+    """
+
+    SOCKET_SEND_BUFFER_SIZE = 64 * 1024
+
+    # seconds to wait on connecting and on each socket read or write to the LRS
+    CONNECTION_TIMEOUT = 60
+
+    # tincan objects only accept attributes declared in _props
+    _props = RemoteLRS._props + ['connection', 'connection_key', 'connection_lock']
+
+    def __init__(self, *args, **kwargs):
+        super(KeepAliveRemoteLRS, self).__init__(*args, **kwargs)
+        self._connection = None
+        self._connection_key = None
+        self._connection_lock = threading.Lock()
+
+    def _connect(self, parsed):
+        if parsed.scheme == "https":
+            connection = httplib.HTTPSConnection(parsed.hostname, parsed.port, timeout=self.CONNECTION_TIMEOUT)
+        else:
+            connection = httplib.HTTPConnection(parsed.hostname, parsed.port, timeout=self.CONNECTION_TIMEOUT)
+        connection.connect()
+        connection.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SOCKET_SEND_BUFFER_SIZE)
+        connection.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return connection
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+        self._connection_key = None
+
+    def _send_request(self, request):
+        """Send request over the persistent connection and return an LRSResponse.
+
+        Builds the request as tincan.remote_lrs.RemoteLRS._send_request does.
+        Raises XAPIBridgeLRSResponseError if the request was sent but no complete response was received.
+        """
+        headers = {"X-Experience-API-Version": self.version, "Connection": "keep-alive"}
+
+        if self.auth is not None:
+            headers["Authorization"] = self.auth
+
+        headers.update(request.headers)
+
+        params = request.query_params
+        params = {k: unicode(params[k]).encode('utf-8') for k in params.keys()}
+        params = urllib.urlencode(params)
+
+        if request.resource.startswith('http'):
+            url = request.resource
+        else:
+            url = self.endpoint
+            url += request.resource
+
+        parsed = urlparse(url)
+
+        path = parsed.path
+        if parsed.query or parsed.path:
+            path += "?"
+            if parsed.query:
+                path += parsed.query
+            if params:
+                path += params
+
+        body = request.content if hasattr(request, "content") else None
+        connection_key = (parsed.scheme, parsed.hostname, parsed.port)
+
+        with self._connection_lock:
+            if self._connection_key != connection_key:
+                self._close_connection()
+
+            while True:
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = self._connect(parsed)
+                    self._connection_key = connection_key
+                # the LRS may have dropped the idle connection; retry once on a new one, but only
+                # if it certainly did not process the request, or statements could be stored twice
+                try:
+                    self._connection.request(request.method, path, body, headers)
+                except (httplib.HTTPException, socket.error):
+                    self._close_connection()
+                    if not reused:
+                        raise
+                    continue
+                try:
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    break
+                except httplib.BadStatusLine as e:
+                    self._close_connection()
+                    if not reused or not _closed_without_response(e):
+                        raise exceptions.XAPIBridgeLRSResponseError(repr(e))
+                except (httplib.HTTPException, socket.error) as e:
+                    # the request was sent; whether the LRS processed it is unknown
+                    self._close_connection()
+                    raise exceptions.XAPIBridgeLRSResponseError(repr(e))
+
+            if response.will_close:
+                self._close_connection()
+
+        if (200 <= response.status < 300
+            or (response.status == 404
+                and hasattr(request, "ignore404")
+                and request.ignore404)):
+            success = True
+        else:
+            success = False
+
+        return LRSResponse(
+            success=success,
+            request=request,
+            response=response,
+            data=data,
+        )
+
+    def save_statements_json(self, statements):
+        """Save statements already serialized to JSON to the LRS in a single request.
+
+        The request body is the JSON strings joined into an array, so statements are not serialized again
+        when a batch is retried; the LRS response content is the list of JSON strings sent.
+        """
+        request = HTTPRequest(
+            method="POST",
+            resource="statements"
+        )
+        request.headers["Content-Type"] = "application/json"
+
+        request.content = '[' + ','.join(statements) + ']'
+
+        lrs_response = self._send_request(request)
+
+        if lrs_response.success:
+            lrs_response.content = statements
+
+        return lrs_response
+
+
+lrs = KeepAliveRemoteLRS(**kw)
 
 
 class XAPIBridgeLRSPublisher(object):
@@ -48,16 +205,19 @@ class XAPIBridgeLRSPublisher(object):
     def publish_statements(self, statements):
         """
         params:
-        statements tincan.statement_list.StatementList
+        statements list of Statements serialized to JSON strings
         """
         try:
-            lrs_resp = lrs.save_statements(statements)
-        except (socket.gaierror, ) as e:  # can't connect at all, no response
+            lrs_resp = lrs.save_statements_json(statements)
+        except exceptions.XAPIBridgeLRSResponseError as e:  # request sent, no response
+            e.queue = statements
+            raise
+        except (socket.error, httplib.HTTPException) as e:  # can't connect or send the request, no response
             raise exceptions.XAPIBridgeLRSConnectionError(queue=statements)
 
         if lrs_resp.success:
             for st in lrs_resp.content:
-                logger.info("Succeeded sending statement {}".format(st.to_json()))
+                logger.info("Succeeded sending statement %s", st)
             return lrs_resp
         else:
             resp_dict = json.loads(lrs_resp.data)
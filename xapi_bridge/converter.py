@@ -51,34 +51,90 @@ TRACKING_EVENTS_TO_XAPI_STATEMENT_MAP = {
 }
 
 
+# statement classes are tincan Statements, so every converted statement carries a version
+assert all(issubclass(cls, base.LMSTrackingLogStatement) for cls in TRACKING_EVENTS_TO_XAPI_STATEMENT_MAP.values())
+
+VIDEO_XBLOCK_EVENT_PREFIX = "xblock-video."
+
+
+def _build_dispatch():
+    """Map each raw event type to convert, with and without Video XBlock prefix, to its statement class."""
+    ignored = frozenset(settings.IGNORED_EVENT_TYPES)
+    dispatch = {}
+    for event_type, statement_class in TRACKING_EVENTS_TO_XAPI_STATEMENT_MAP.items():
+        if event_type not in ignored:
+            dispatch[event_type] = statement_class
+            dispatch[VIDEO_XBLOCK_EVENT_PREFIX + event_type] = statement_class
+    return dispatch
+
+
+# event-type dispatch prepared once at import time; ignored and untracked types are absent
+_STATEMENT_CLASSES = _build_dispatch()
+_get_statement_class = _STATEMENT_CLASSES.get
+
+# raw tracking log lines are checked against these before they are decoded
+_CONVERTIBLE_EVENT_TYPES = frozenset(event_type.encode('utf-8') for event_type in _STATEMENT_CLASSES)
+_EVENT_TYPE_KEY = b'"event_type":'
+
+
 def to_xapi(evt):
     """Return tuple of xAPI statements or None if ignored or unhandled event type."""
 
-    # strip Video XBlock prefixes for checking
-    event_type = evt['event_type'].replace("xblock-video.", "")
-
-    if event_type in settings.IGNORED_EVENT_TYPES:
-        return  # deliberately ignored event
+    # a single lookup also covers Video XBlock prefixes and ignored event types
+    statement_class = _get_statement_class(evt['event_type'])
+    if statement_class is None:  # deliberately ignored or untracked event
+        return
 
     # filter video_check from problem_check
-    event_source = evt['event_source']
-    if event_type == 'problem_check' and event_source == 'server':
+    if statement_class is problem.ProblemCheckStatement and evt['event_source'] == 'server':
         event_data = evt['event']
         data = event_data['answers'][event_data['answers'].keys()[0]]
         if 'watch_times' in data:
-            event_type = 'video_check'
-
-    try:
-        statement_class = TRACKING_EVENTS_TO_XAPI_STATEMENT_MAP[event_type]
-    except KeyError:  # untracked event
-        return
+            statement_class = TRACKING_EVENTS_TO_XAPI_STATEMENT_MAP['video_check']
 
     try:
-        statement = statement_class(evt)
-        if hasattr(statement, 'version'):  # make sure it's a proper statement
-            return (statement, )
-        else:
-            message = "Statement missing version."
-            raise exceptions.XAPIBridgeStatementConversionError(event=evt, message=message)
+        return (statement_class(evt), )
     except exceptions.XAPIBridgeSkippedConversion as e:
-        logger.debug("Skipping conversion of event with message {}.  Event was {}".format(e.message, evt))
+        logger.debug("Skipping conversion of event with message %s.  Event was %s", e.message, evt)
+
+
+def to_xapi_batch(evts):
+    """Return list of xAPI statements for a sequence of events, leaving out ignored and unhandled events.
+
+    Errors converting an event, including a user or course not found in the LMS, only skip that event.
+    """
+    statements = []
+    for evt in evts:
+        try:
+            xapi = to_xapi(evt)
+        except exceptions.XAPIBridgeException as e:
+            e.err_continue_msg()
+            continue
+        if xapi is not None:
+            statements.extend(xapi)
+    return statements
+
+
+def is_convertible_line(line):
+    """Return False if a raw tracking log line certainly holds an ignored or unhandled event type.
+
+    Looks at every "event_type" key in the undecoded line, since nested event data can hold one too,
+    so the line is only rejected if none of them is a type that would be converted.
+    """
+    found = False
+    start = line.find(_EVENT_TYPE_KEY)
+    while start != -1:
+        start += len(_EVENT_TYPE_KEY)
+        while line[start:start + 1] == b' ':
+            start += 1
+        end = line.find(b'"', start + 1)
+        if line[start:start + 1] != b'"' or end == -1:
+            return True  # not a plain string value; leave it to the JSON decoder
+        event_type = line[start + 1:end]
+        if b'\\' in event_type:
+            return True
+        if event_type in _CONVERTIBLE_EVENT_TYPES:
+            return True
+        found = True
+        start = line.find(_EVENT_TYPE_KEY, end)
+    return not found
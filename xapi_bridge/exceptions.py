@@ -20,6 +20,12 @@ except ImportError:
     logger.info("No Sentry.io integration defined for xapi Bridge")
 
 
+def statement_json(statement):
+    """Return the JSON for a Statement, which may already be queued as a JSON string."""
+    if isinstance(statement, basestring):
+        return statement
+    return statement.to_json()
+
 
 class XAPIBridgeSentryMixin(object):
     """Defines exception class methods for exceptions to explicityly send messages or exceptions to Sentry.io."""
@@ -45,12 +51,12 @@ class XAPIBridgeSentryMixin(object):
                 extra_context = dict()
                 user = None
                 if hasattr(self, 'statement'):
-                    extra_context.update({'xAPI Statement': self.statement.to_json()})
+                    extra_context.update({'xAPI Statement': statement_json(self.statement)})
                 if hasattr(self, 'event'):
                     user = self.event['username']
                     extra_context.update({'Tracking Log Event': json.dumps(self.event)})
                 if hasattr(self, 'queue') and self.queue is not None:
-                    extra_context.update({'Queued unsent Statements': '\n'.join(st.to_json() for st in self.queue)})
+                    extra_context.update({'Queued unsent Statements': '\n'.join(statement_json(st) for st in self.queue)})
                 scope = self.update_sentry_scope(scope, 'warning', **extra_context)
                 if log_type == 'exception':
                     capture_exception(self)
@@ -110,6 +116,15 @@ class XAPIBridgeLRSConnectionError(XAPIBridgeConnectionError):
         super(XAPIBridgeLRSConnectionError, self).__init__(self.message, *args)
 
 
+class XAPIBridgeLRSResponseError(XAPIBridgeConnectionError):
+    """Exception class for failures after a request was sent to an LRS, which may have stored its Statements."""
+
+    def __init__(self, message=None, queue=None, *args):
+        self.queue = queue
+        self.message = "No response from remote LRS at {} after sending the request, Statements may have been stored. {}".format(settings.LRS_ENDPOINT, message)
+        super(XAPIBridgeLRSResponseError, self).__init__(self.message, *args)
+
+
 class XAPIBridgeUserNotFoundError(XAPIBridgeException):
     """Exception class for no LMS user found."""
 
@@ -1,6 +1,8 @@
 """Utility functions for xapi bridge."""
 
 import logging
+import threading
+import time
 
 import memcache
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=unused-import
@@ -20,6 +22,41 @@ from xapi_bridge import constants, exceptions, settings
 logger = logging.getLogger(__name__)
 
 
+class LocalTTLCache(object):
+    """
+    Thread-safe in-process cache whose entries expire after ttl seconds.
+    Saves repeated LMS API requests for the same user or course within a burst of events.
+    """
+
+    def __init__(self, ttl=300, maxsize=4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                now = time.time()
+                for k in [k for k, (expires, _) in self._data.items() if expires < now]:
+                    del self._data[k]
+                if len(self._data) >= self.maxsize:
+                    self._data.clear()
+            self._data[key] = (time.time() + self.ttl, value)
+
+
 class EnrollmentApiClient(object):
     """
     Object builds an API client to make calls to the edxapp Enrollment API.
@@ -44,6 +81,7 @@ class EnrollmentApiClient(object):
         self.cache = False
         if settings.LMS_API_USE_MEMCACHED:
             self.cache = memcache.Client([settings.MEMCACHED_ADDRESS], debug=0)
+        self.local_cache = LocalTTLCache(ttl=getattr(settings, 'LMS_API_LOCAL_CACHE_TTL', 300))
         self.client = EdxRestApiClient(
             self.API_BASE_URL, append_slash=self.APPEND_SLASH,
             username="xapi_bridge", oauth_access_token=token[0]
@@ -54,6 +92,16 @@ class EnrollmentApiClient(object):
         Query the Enrollment API for the course details of the given course_id.
         unti is flag for University 2035 LRS data inegration
         """
+        # a single event can reference its course several times
+        cached_course_info = self.local_cache.get((course_id, unti))
+        if cached_course_info is not None:
+            return cached_course_info
+
+        course_info = self._get_course_info_from_api(course_id, unti)
+        self.local_cache.set((course_id, unti), course_info)
+        return course_info
+
+    def _get_course_info_from_api(self, course_id, unti=False):
         try:
             resp = self.client.course(u'{}?include_expired=1'.format(course_id)).get()
 
@@ -61,7 +109,7 @@ class EnrollmentApiClient(object):
                 data = {'name': resp['course_name'], 'description': resp['description']}
                 if unti and resp['integrate_2035_id'].strip():
                     data.update({'2035_id': resp['integrate_2035_id']})
-                logger.error('get_course_info {}'.format(data))
+                logger.debug('get_course_info %s', data)
                 return data
             #if unti and resp:
             #    if resp['integrate_2035_id'].strip():
@@ -106,6 +154,7 @@ class UserApiClient(object):
         self.cache = False
         if settings.LMS_API_USE_MEMCACHED:
             self.cache = memcache.Client([settings.MEMCACHED_ADDRESS], debug=0)
+        self.local_cache = LocalTTLCache(ttl=getattr(settings, 'LMS_API_LOCAL_CACHE_TTL', 300))
         self.client = EdxRestApiClient(
             self.API_BASE_URL, append_slash=self.APPEND_SLASH,
             username="xapi_bridge", oauth_access_token=token[0]
@@ -145,16 +194,20 @@ class UserApiClient(object):
             raise exceptions.XAPIBridgeUserNotFoundError()
             # return {'email': '', 'fullname': ''}
 
+        cached_user_info = self.local_cache.get(username)
+        if cached_user_info is not None:
+            return cached_user_info
+
         if hasattr(self, 'cache') and self.cache:
-            cached_user_info = self.cache.get(self.CACHE_ACCOUNTS_PREFIX + username)
-            if not cached_user_info:
+            user_info = self.cache.get(self.CACHE_ACCOUNTS_PREFIX + username)
+            if not user_info:
                 user_info = _get_user_info_from_api(username, unti=settings.UNTI_XAPI)
                 self.cache.set(self.CACHE_ACCOUNTS_PREFIX + username, user_info, time=300)
-                return user_info
-            else:
-                return cached_user_info
         else:
-            return _get_user_info_from_api(username, unti=settings.UNTI_XAPI)
+            user_info = _get_user_info_from_api(username, unti=settings.UNTI_XAPI)
+
+        self.local_cache.set(username, user_info)
+        return user_info
 
 
 user_api_client = UserApiClient()
@@ -19,7 +19,7 @@ class LRSBackend(base.LRSBackendBase):
         try:
             warnings = error.get('warnings')
             problem_msg = warnings[0]
-            object_matcher = re.search('^Problem in \'statements\.(\d)', problem_msg, re.UNICODE)
+            object_matcher = re.search('^Problem in \'statements\.(\d+)', problem_msg, re.UNICODE)
             if object_matcher:
                 return int(object_matcher.group(1))
             else:
@@ -5,18 +5,13 @@ PUBLISH_MAX_WAIT_TIME = 60
 # the number of statements to publish per batch
 PUBLISH_MAX_PAYLOAD = 10
 
+# the maximum number of statements sent to the LRS in a single request;
+# more than PUBLISH_MAX_PAYLOAD only when a backlog has built up
+PUBLISH_BATCH_SIZE = 100
+
 # maximum publish retries on LRS connection error
 PUBLISH_MAX_RETRIES = 1
 
-# sleep time between polls of watched log file, in seconds
-NOTIFIER_READ_FREQ = 2
-
-# how long to wait for activity when polling, in milliseconds
-# https://docs.python.org/2.4/lib/poll-objects.html
-# If timeout is omitted, negative, or None, the call will block until
-# there is an event for this poll object.
-NOTIFIER_POLL_TIMEOUT = 1000
-
 # lrs credentials
 LRS_ENDPOINT = 'https://lrs.adlnet.gov/xAPI/'
 LRS_USERNAME = 'fakeuser'
@@ -33,6 +28,9 @@ OPENEDX_OAUTH2_CLIENT_SECRET = "notasecret"
 LMS_API_USE_MEMCACHED = False
 MEMCACHED_ADDRESS = "127.0.0.1:11211"
 
+# seconds to keep LMS user and course details in the bridge's in-process cache
+LMS_API_LOCAL_CACHE_TTL = 300
+
 # events configuration
 # list of ignored event ids
 IGNORED_EVENT_TYPES = []
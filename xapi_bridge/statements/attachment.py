@@ -8,6 +8,10 @@ import course
 from xapi_bridge import settings, constants
 
 
+ATTACHED_VERB = Verb(
+    id=constants.XAPI_VERB_ATTACHED,
+    display=LanguageMap({'en-US': 'attached', 'ru-RU': 'приложен'}),
+)
 
 
 class AttachmentStatement(block.BaseCoursewareBlockStatement):
@@ -60,10 +64,7 @@ class AttachmentStatement(block.BaseCoursewareBlockStatement):
         )
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_ATTACHED,
-            display=LanguageMap({'en-US': 'attached', 'ru-RU': 'приложен'}),
-        )
+        return ATTACHED_VERB
 
     def get_result(self, event):
         return Result(
@@ -10,6 +10,12 @@ from tincan import Agent, AgentAccount, Context, Statement, ActivityDefinition,
 
 from xapi_bridge import constants, exceptions, lms_api, settings
 
+try:
+    # optional C ISO 8601 parser; without it tincan parses timestamp strings itself
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = None
+
 
 class LMSTrackingLogStatement(Statement):
     """Base class for xAPI Bridge Statements from Open edX LMS tracking logs."""
@@ -97,7 +103,13 @@ class LMSTrackingLogStatement(Statement):
 
     def get_timestamp(self, event):
         """Get the Timestamp for the statement."""
-        return event['time']
+        timestamp = event['time']
+        if parse_datetime is not None and isinstance(timestamp, basestring):
+            parsed = parse_datetime(timestamp)
+            # tincan stores a datetime as given; leave timestamps without an offset to tincan's own parsing
+            if parsed.tzinfo is not None:
+                return parsed
+        return timestamp
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """xAPI Statements and Activities for verbs on courses as a whole."""
 
+import logging
 
 from tincan import Activity, ActivityDefinition, LanguageMap, Verb, Agent, AgentAccount, Result
 
@@ -8,6 +9,29 @@ import base
 from xapi_bridge import lms_api, constants, settings
 
 
+logger = logging.getLogger(__name__)
+
+
+REGISTERED_VERB = Verb(
+    id=constants.XAPI_VERB_REGISTERED,
+    display=LanguageMap({'en-US': 'registered', 'ru-RU': u'записался'}),
+)
+
+EXITED_VERB = Verb(
+    id=constants.XAPI_VERB_EXITED,
+    display=LanguageMap({'en-US': 'exited', 'ru-RU': u'отчислился'}),
+)
+
+FAILED_VERB = Verb(
+    id=constants.XAPI_VERB_FAILED,
+    display=LanguageMap({'en-US': 'failed', 'ru-RU': u'отчислен'}),
+)
+
+COMPLETED_VERB = Verb(
+    id=constants.XAPI_VERB_COMPLETED,
+    display=LanguageMap({'en-US': 'completed', 'ru-RU': u'закончил курс'}),
+)
+
 
 class CourseActivityDefinition(ActivityDefinition):
     enrollment_api_client = lms_api.enrollment_api_client
@@ -27,7 +51,7 @@ class CourseActivityDefinition(ActivityDefinition):
         if unti:
             kwargs.update({'extensions': {ext_url: course_info['2035_id']}})
 
-        logger.error('CourseActivityDefinition {}'.format(kwargs))
+        logger.debug('CourseActivityDefinition %s', kwargs)
         super(CourseActivityDefinition, self).__init__(*args, **kwargs)
 
 
@@ -49,30 +73,21 @@ class CourseEnrollmentStatement(CourseStatement):
     """Statement for course enrollment."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_REGISTERED,
-            display=LanguageMap({'en-US': 'registered', 'ru-RU': u'записался'}),
-        )
+        return REGISTERED_VERB
 
 
 class CourseUnenrollmentStatement(CourseStatement):
     """Statement for course unenrollment."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_EXITED,
-            display=LanguageMap({'en-US': 'exited', 'ru-RU': u'отчислился'}),
-        )
+        return EXITED_VERB
 
 
 class CourseExpellStatement(CourseStatement):
     """Statement for course unenrollment."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_FAILED,
-            display=LanguageMap({'en-US': 'failed', 'ru-RU': u'отчислен'}),
-        )
+        return FAILED_VERB
 
 
 class CourseCompletionStatement(CourseStatement):
@@ -84,10 +99,7 @@ class CourseCompletionStatement(CourseStatement):
     # TODO: what happens when a course is un-completed? (e.g., certificate is revoked or other)
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_COMPLETED,
-            display=LanguageMap({'en-US': 'completed', 'ru-RU': u'закончил курс'}),
-        )
+        return COMPLETED_VERB
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
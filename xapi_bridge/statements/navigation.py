@@ -7,6 +7,17 @@ from xapi_bridge import constants, settings
 from tincan import Activity, ActivityDefinition, ActivityList, Context, ContextActivities, Extensions, LanguageMap, Verb
 
 
+INITIALIZED_VERB = Verb(
+    id=constants.XAPI_VERB_INITIALIZED,
+    display=LanguageMap({'en': 'initialized'}),
+)
+
+EXPERIENCED_VERB = Verb(
+    id=constants.XAPI_VERB_EXPERIENCED,
+    display=LanguageMap({'en': 'experienced'}),
+)
+
+
 class NavigationSequenceStatement(base.LMSTrackingLogStatement):
 
     def get_object(self, event):
@@ -48,19 +59,13 @@ class NavigationSequenceTabStatement(NavigationSequenceStatement):
     """A new tab selected within a Unit."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_INITIALIZED,
-            display=LanguageMap({'en': 'initialized'}),
-        )
+        return INITIALIZED_VERB
 
 
 class NavigationLinkStatement(base.LMSTrackingLogStatement):
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_EXPERIENCED,
-            display=LanguageMap({'en': 'experienced'})
-        )
+        return EXPERIENCED_VERB
 
     def get_object(self, event):
         event_data = self.get_event_data(event)
@@ -119,10 +124,7 @@ class NavigationSectionSelectionStatement(base.LMSTrackingLogStatement):
         )
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_INITIALIZED,
-            display=LanguageMap({'en': 'initialized'}),
-        )
+        return INITIALIZED_VERB
 
     def get_context_activities(self, event):
         event_data = self.get_event_data(event)
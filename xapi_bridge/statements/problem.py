@@ -15,6 +15,22 @@ import logging
 log = logging.getLogger(__name__)
 
 
+ANSWERED_VERB = Verb(
+    id=constants.XAPI_VERB_ANSWERED,
+    display=LanguageMap({'en-US': 'answered', 'ru-RU': 'дан ответ'}),
+)
+
+ATTEMPTED_VERB = Verb(
+    id=constants.XAPI_VERB_ATTEMPTED,
+    display=LanguageMap({'en': 'attempted'}),
+)
+
+RESET_VERB = Verb(
+    id=constants.XAPI_VERB_INITIALIZED,
+    display=LanguageMap({'en': 'reset'}),
+)
+
+
 class ProblemStatement(block.BaseCoursewareBlockStatement):
     """ Statement base for problem events."""
 
@@ -60,10 +76,7 @@ class ProblemCheckStatement(ProblemStatement):
         super(ProblemCheckStatement, self).__init__(event, *args, **kwargs)
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_ANSWERED,
-            display=LanguageMap({'en-US': 'answered', 'ru-RU': 'дан ответ'}),
-        )
+        return ANSWERED_VERB
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
@@ -74,7 +87,7 @@ class ProblemCheckStatement(ProblemStatement):
             answer = []
             for key in data:
                 trash = data[key]['answer']
-                if type(trash) is not unicode:
+                if not isinstance(trash, basestring):
                     for i in trash:
                         p = re.sub(r"(\n.*)", r'', i)
                         answer.append(p)
@@ -135,10 +148,7 @@ class ProblemSubmittedStatement(ProblemStatement):
     """
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_ATTEMPTED,
-            display=LanguageMap({'en': 'attempted'}),
-        )
+        return ATTEMPTED_VERB
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
@@ -159,10 +169,7 @@ class ProblemResetStatement(ProblemStatement):
     """Statement for student resetting answer to a problem."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_INITIALIZED,
-            display=LanguageMap({'en': 'reset'}),
-        )
+        return RESET_VERB
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
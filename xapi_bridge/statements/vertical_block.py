@@ -13,14 +13,17 @@ import logging
 log = logging.getLogger(__name__)
 
 
+COMPLETED_VERB = Verb(
+    id=constants.XAPI_VERB_COMPLETED,
+    display=LanguageMap({'en-US': 'completed', 'ru-RU': 'завершен'}),
+)
+
+
 class VerticalBlockCompleteStatement(block.BaseCoursewareBlockStatement):
     """ Statement for vertical block complete event."""
 
     def get_verb(self, event):
-        return Verb(
-            id=constants.XAPI_VERB_COMPLETED,
-            display=LanguageMap({'en-US': 'completed', 'ru-RU': 'завершен'}),
-        )
+        return COMPLETED_VERB
 
     def get_object(self, event):
         """
@@ -42,7 +45,7 @@ class VerticalBlockCompleteStatement(block.BaseCoursewareBlockStatement):
 
     def get_result(self, event):
 
-        log.error(event)
+        log.debug(event)
         try:
             return Result(
                 score={
@@ -61,6 +61,11 @@ VIDEO_STATE_CHANGE_VERB_MAP = {
 
 }
 
+VIDEO_STATE_CHANGE_VERBS = {
+    event_type: Verb(id=verb_props['id'], display=verb_props['display'])
+    for event_type, verb_props in VIDEO_STATE_CHANGE_VERB_MAP.items()
+}
+
 
 class VideoStatement(block.BaseCoursewareBlockStatement):
     """ Statement base for video interaction events."""
@@ -102,13 +107,9 @@ class VideoStatement(block.BaseCoursewareBlockStatement):
     def get_verb(self, event):
         event_type = event['event_type']
         try:
-            verb_props = VIDEO_STATE_CHANGE_VERB_MAP[event_type]
+            return VIDEO_STATE_CHANGE_VERBS[event_type]
         except KeyError:
             return exceptions.XAPIBridgeSkippedConversion("unhandled video event: {}".format(event_type))
-        return Verb(
-            id=verb_props['id'],
-            display=verb_props['display'],
-        )
 
     def get_result(self, event):
         event_data = self.get_event_data(event)
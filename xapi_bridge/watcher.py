@@ -0,0 +1,102 @@
+"""Watch a file with inotify, blocking in epoll on the inotify file descriptor."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+
+
+# inotify event masks, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+
+# inotify_init1 flags
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event header: wd, mask, cookie, len; followed by len bytes of name
+_EVENT_HEADER = struct.Struct('iIII')
+
+# enough for a few hundred queued events per read
+READ_SIZE = 16 * 1024
+
+_libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+
+def _check_call(result, path=None):
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+    return result
+
+
+class Watcher(object):
+    """Watch a single file and dispatch its inotify events to a handler.
+
+    The handler must provide process_IN_MODIFY, process_IN_MOVE_SELF and process_IN_DELETE_SELF methods,
+    each called with the event mask.  All modifications read together are dispatched as one IN_MODIFY call.
+    """
+
+    def __init__(self, path, mask, handler):
+        self.handler = handler
+        self.fd = _check_call(_libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        try:
+            if isinstance(path, unicode):
+                path = path.encode(sys.getfilesystemencoding())
+            _check_call(_libc.inotify_add_watch(self.fd, path, mask), path)
+            self.epoll = select.epoll()
+            self.epoll.register(self.fd, select.EPOLLIN)
+        except Exception:
+            os.close(self.fd)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the epoll and inotify instances."""
+        self.epoll.close()
+        os.close(self.fd)
+
+    def loop(self):
+        """Block until events arrive and dispatch them, forever or until the handler raises."""
+        while True:
+            try:
+                ready = self.epoll.poll()
+            except (IOError, OSError) as e:
+                if e.errno == errno.EINTR:  # interrupted by a signal
+                    continue
+                raise
+            if ready:
+                self.read_events()
+
+    def read_events(self):
+        """Read all queued inotify events and dispatch them to the handler."""
+        mask = 0
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, event_mask, cookie, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                mask |= event_mask
+                offset += _EVENT_HEADER.size + name_length
+
+        if mask & (IN_MODIFY | IN_Q_OVERFLOW):
+            self.handler.process_IN_MODIFY(mask)
+        if mask & IN_MOVE_SELF:
+            self.handler.process_IN_MOVE_SELF(mask)
+        if mask & IN_DELETE_SELF:
+            self.handler.process_IN_DELETE_SELF(mask)